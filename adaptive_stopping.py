@@ -0,0 +1,100 @@
+import math
+
+
+class CoverageController:
+    """Decides when an interview or review has stopped learning anything new.
+
+    Each round is scored by its marginal gain: the share of retrieved paper
+    chunks that had not been cited before, times how novel the question is
+    compared with the earlier ones. A repeated question therefore scores zero
+    even when it happens to pull in a new chunk. The session ends once the
+    gain stays below the threshold for `patience` rounds in a row.
+    """
+
+    def __init__(self, embeddings, total_chunks=None, threshold=0.15,
+                 patience=2, min_rounds=2, max_rounds=12, similarity_floor=0.7):
+        """Set up the stopping policy.
+
+        Args:
+        ------
+        embeddings: embedding model used to compare questions.
+        total_chunks: number of chunks in the paper's vector store.
+        threshold: marginal gain below which a round counts as redundant.
+        patience: consecutive redundant rounds before stopping.
+        min_rounds: rounds always played, whatever the gain.
+        max_rounds: hard upper bound on the number of rounds.
+        similarity_floor: question similarity treated as fully novel, since
+            any two on-topic questions already embed this close together.
+        """
+        self.embeddings = embeddings
+        self.total_chunks = total_chunks
+        self.threshold = threshold
+        self.patience = patience
+        self.min_rounds = min_rounds
+        self.max_rounds = max_rounds
+        self.similarity_floor = similarity_floor
+
+        self.seen_chunks = set()
+        self.question_vectors = []
+        self.gains = []
+        self._low_gain_rounds = 0
+
+    def update(self, question, source_documents):
+        """Record one question/answer round.
+
+        Args:
+        ------
+        question: the question asked this round.
+        source_documents: chunks retrieved to answer it.
+
+        Outputs:
+        ------
+        gain: the marginal gain of this round.
+        """
+        novelty = self._question_novelty(question)
+
+        chunk_ids = {self._chunk_id(doc) for doc in source_documents}
+        new_chunks = chunk_ids - self.seen_chunks
+        self.seen_chunks |= chunk_ids
+        chunk_gain = len(new_chunks) / len(chunk_ids) if chunk_ids else 0.0
+
+        gain = chunk_gain * novelty
+        self.gains.append(gain)
+        if gain < self.threshold:
+            self._low_gain_rounds += 1
+        else:
+            self._low_gain_rounds = 0
+        return gain
+
+    def should_stop(self):
+        rounds = len(self.gains)
+        if rounds >= self.max_rounds:
+            return True
+        if rounds < self.min_rounds:
+            return False
+        if self.total_chunks and len(self.seen_chunks) >= self.total_chunks:
+            return True
+        return self._low_gain_rounds >= self.patience
+
+    @property
+    def coverage(self):
+        """Fraction of the paper's chunks cited so far."""
+        if not self.total_chunks:
+            return None
+        return len(self.seen_chunks) / self.total_chunks
+
+    def _question_novelty(self, question):
+        vector = self.embeddings.embed_query(question)
+        similarity = max((_cosine(vector, previous) for previous in self.question_vectors), default=0.0)
+        self.question_vectors.append(vector)
+        return min(1.0, max(0.0, (1.0 - similarity) / (1.0 - self.similarity_floor)))
+
+    @staticmethod
+    def _chunk_id(doc):
+        return (doc.metadata.get('source'), doc.metadata.get('page'), doc.page_content)
+
+
+def _cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -7,15 +7,13 @@ from langchain.prompts import (
 )
 from langchain.chains import LLMChain
 from langchain.chains import ConversationChain
-from langchain.chat_models import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
+from model_router import ModelRouter
 
 class DebateBot:
-    def __init__(self, engine):
-        if engine == 'OpenAI':
-            self.llm = ChatOpenAI(model_name="gpt-4", temperature=0.7)
-        else:
-            raise KeyError("Unsupported chat model!")
+    def __init__(self, engine, router=None):
+        self.router = router or ModelRouter(engine)
+        self.llm = self.router.chat_model('debate_turn')
         self.memory = ConversationBufferMemory(return_messages=True)
 
     def instruct(self, role, oppo_role, scenario, session_length, starter=False):
@@ -61,12 +59,13 @@ class DebateBot:
         return prompt
 
 class DualDebateBots:
-    def __init__(self, engine, role_dict, scenario, session_length):
+    def __init__(self, engine, role_dict, scenario, session_length, router=None):
         self.chatbots = role_dict
         self.engine = engine
+        self.router = router or ModelRouter(engine)
         
         for k in role_dict.keys():
-            self.chatbots[k].update({'chatbot': DebateBot(engine)})
+            self.chatbots[k].update({'chatbot': DebateBot(engine, self.router)})
             
         self.chatbots['role1']['chatbot'].instruct(
             role=self.chatbots['role1'],
@@ -97,7 +96,7 @@ class DualDebateBots:
         return output1, output2
 
     def summary(self, script):
-        summary_bot = ChatOpenAI(model_name="gpt-4o", temperature=0.5)
+        summary_bot = self.router.chat_model('summary')
         instruction = """Analyze this debate transcript and create a structured summary:
         1. List Pro's main arguments with supporting points
         2. List Con's main arguments with supporting points
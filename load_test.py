@@ -0,0 +1,516 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Drives N simulated sessions of each mode through main.py with Streamlit's
+AppTest, all inside one process the way a single `streamlit run main.py`
+worker would host them. LLM and embedding calls go to a local fake
+OpenAI-compatible server with configurable latency, so no API key or quota
+is used.
+
+Usage:
+    python load_test.py --levels 1,2,4,8 --latency 0.8 --jitter 0.2
+
+Notes:
+- Each AppTest run installs and then clears process-wide test globals (the
+  Runtime instance, config patches, the pages cache). Concurrent runs would
+  tear them down under each other, so the harness installs them once for
+  the whole load test and runs sessions without the per-run setup. Sessions
+  therefore share one mocked runtime, and the Tornado/websocket layer of a
+  real worker is not exercised. Treat the results as a lower bound on
+  per-session cost.
+- AppTest cannot drive file uploads, so the harness replaces
+  `file_uploader` with one that returns a small generated PDF.
+- Embeddings from the fake server are hashed bags of tokens. Questions that
+  reuse wording look similar, so adaptive stopping behaves roughly as it
+  would against the real API.
+- tiktoken must already have its encoding cached, since OpenAIEmbeddings
+  tokenizes locally before calling the server.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+EMBEDDING_DIM = 256
+VOCABULARY = (
+    "model method results dataset baseline ablation training evaluation loss "
+    "attention retrieval benchmark accuracy robustness theory proof experiment "
+    "variance sample bias limitation contribution architecture metric"
+).split()
+
+# Inputs each mode needs before its start button does anything
+MODE_INPUTS = {
+    "Debate": {
+        "text_input": {"Debate Topic 💬": "Should cities ban private cars?"},
+        "button": "Generate Debate"
+    },
+    "Paper Digest": {
+        "text_input": {"Paper Topic 🧪": "Retrieval-augmented generation"},
+        "text_area": {"Abstract 📝": "We study retrieval-augmented generation."},
+        "button": "Generate Interview"
+    },
+    "Peer-review Simulation": {
+        "text_input": {"Paper Title 📝": "Retrieval-augmented generation at scale"},
+        "text_area": {"Abstract 🔬": "We study retrieval-augmented generation."},
+        "multiselect": {"Review Focus Areas": ["Methodology", "Results"]},
+        "button": "Start Review Process"
+    }
+}
+
+# Bot calls timed as individual turns in each mode. The last call listed
+# for a mode closes one question/answer round.
+TURN_METHODS = {
+    "Debate": [("debate", "DualDebateBots", "step")],
+    "Paper Digest": [("paper_digest", "JournalistBot", "step"),
+                     ("paper_digest", "AuthorBot", "step")],
+    "Peer-review Simulation": [("peer_review", "PeerReviewReviewerBot", "generate_question"),
+                               ("peer_review", "PeerReviewAuthorBot", "respond_to_question")]
+}
+
+
+class FakeOpenAIServer:
+    """OpenAI-compatible chat and embeddings endpoints with synthetic latency."""
+
+    def __init__(self, latency=0.5, jitter=0.1, error_rate=0.0, response_words=120):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.response_words = response_words
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                status, payload = server.handle(self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, path, body):
+        with self._lock:
+            self.requests += 1
+        time.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+        if random.random() < self.error_rate:
+            return 429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                   "code": "rate_limit_exceeded"}}
+        if path.endswith("/embeddings"):
+            return 200, self._embeddings(body)
+        if path.endswith("/chat/completions"):
+            return 200, self._chat(body)
+        return 404, {"error": {"message": f"Unknown path {path}", "type": "invalid_request_error"}}
+
+    def _chat(self, body):
+        text = " ".join(random.choice(VOCABULARY) for _ in range(self.response_words))
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        return {
+            "id": f"chatcmpl-{random.getrandbits(32):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text.capitalize() + "?"}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": self.response_words,
+                      "total_tokens": prompt_tokens + self.response_words}
+        }
+
+    def _embeddings(self, body):
+        inputs = body.get("input", [])
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        data = [{"object": "embedding", "index": i, "embedding": _hashed_embedding(item)}
+                for i, item in enumerate(inputs)]
+        return {"object": "list", "data": data, "model": body.get("model", "fake"),
+                "usage": {"prompt_tokens": 0, "total_tokens": 0}}
+
+
+def _hashed_embedding(item):
+    tokens = item.split() if isinstance(item, str) else item
+    vector = [0.0] * EMBEDDING_DIM
+    for token in tokens:
+        vector[zlib.crc32(str(token).lower().encode()) % EMBEDDING_DIM] += 1.0
+    norm = sum(x * x for x in vector) ** 0.5 or 1.0
+    return [x / norm for x in vector]
+
+
+def _sample_pdf(pages=20):
+    """Build a small multi-page PDF that PyPDFLoader can read."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        words = random.Random(page).choices(VOCABULARY, k=60)
+        lines = [" ".join(words[i:i + 10]) for i in range(0, len(words), 10)]
+        stream = b"BT /F1 11 Tf 72 720 Td 14 TL " + b" ".join(
+            f"({line}) Tj T*".encode() for line in [f"Section {page + 1}"] + lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+class _FakeUpload:
+    def __init__(self, name, data):
+        self.name = name
+        self._data = data
+
+    def getbuffer(self):
+        return memoryview(self._data)
+
+
+def _patch_file_uploader(pdf):
+    from streamlit.delta_generator import DeltaGenerator
+
+    def file_uploader(self, label, *args, **kwargs):
+        return _FakeUpload("paper.pdf", pdf)
+
+    DeltaGenerator.file_uploader = file_uploader
+
+
+class TurnRecorder:
+    """Times every bot turn by wrapping the turn methods in place."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = {mode: [] for mode in TURN_METHODS}
+        self.rounds = {mode: 0 for mode in TURN_METHODS}
+
+    def install(self):
+        import importlib
+        for mode, methods in TURN_METHODS.items():
+            for i, (module_name, class_name, method_name) in enumerate(methods):
+                cls = getattr(importlib.import_module(module_name), class_name)
+                closes_round = i == len(methods) - 1
+                setattr(cls, method_name, self._timed(mode, getattr(cls, method_name), closes_round))
+
+    def _timed(self, mode, method, closes_round):
+        recorder = self
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                with recorder._lock:
+                    recorder.turns[mode].append(time.perf_counter() - start)
+                    if closes_round:
+                        recorder.rounds[mode] += 1
+        return wrapper
+
+    def drain(self, mode):
+        """Return and reset the turn durations and round count of `mode`."""
+        with self._lock:
+            turns, self.turns[mode] = self.turns[mode], []
+            rounds, self.rounds[mode] = self.rounds[mode], 0
+        return turns, rounds
+
+
+@contextmanager
+def shared_test_runtime():
+    """Install the globals AppTest sets up around every run, once for the
+    whole load test, so concurrent sessions cannot tear them down under
+    each other."""
+    from unittest.mock import MagicMock
+
+    from streamlit import source_util
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1.util import patch_config_options
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    with source_util._pages_cache_lock:
+        saved_pages = source_util._cached_pages
+        source_util._cached_pages = None
+
+    try:
+        with patch_config_options({"runner.postScriptGC": False}):
+            yield
+    finally:
+        with source_util._pages_cache_lock:
+            source_util._cached_pages = saved_pages
+        Runtime._instance = None
+
+
+def _concurrent_app_test(script_path, timeout):
+    """AppTest whose runs skip the per-run global setup and teardown,
+    relying on `shared_test_runtime` instead."""
+    from urllib import parse
+
+    from streamlit.testing.v1 import AppTest
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    class ConcurrentAppTest(AppTest):
+        def _run(self, widget_state=None, timeout=None):
+            if timeout is None:
+                timeout = self.default_timeout
+            script_runner = LocalScriptRunner(self._script_path, self.session_state)
+            self._tree = script_runner.run(widget_state, self.query_params, timeout)
+            self._tree._runner = self
+            query_string = script_runner.event_data[-1]["client_state"].query_string
+            self.query_params = parse.parse_qs(query_string)
+            return self
+
+    return ConcurrentAppTest(script_path, default_timeout=timeout)
+
+
+def _widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise KeyError(f"No widget labelled {label!r}")
+
+
+def run_session(mode, timeout):
+    """Drive one session of `mode` from a fresh page load to its summary.
+
+    Outputs:
+    ------
+    at: the AppTest, which holds the session's state like an open browser tab.
+    error: None on success, otherwise a short description of the failure.
+    """
+    inputs = MODE_INPUTS[mode]
+    at = _concurrent_app_test(MAIN_SCRIPT, timeout)
+    at.run()
+    _widget(at.sidebar.text_input, "OpenAI API Key 🔑").input("sk-load-test")
+    _widget(at.sidebar.selectbox, "Select Mode 📖").select(mode)
+    at.run()
+
+    for label, value in inputs.get("text_input", {}).items():
+        _widget(at.sidebar.text_input, label).input(value)
+    for label, value in inputs.get("text_area", {}).items():
+        _widget(at.sidebar.text_area, label).input(value)
+    for label, values in inputs.get("multiselect", {}).items():
+        widget = _widget(at.sidebar.multiselect, label)
+        for value in values:
+            widget.select(value)
+    _widget(at.sidebar.button, inputs["button"]).click()
+    at.run()
+
+    if at.exception:
+        return at, at.exception[0].message
+    if at.sidebar.error:
+        return at, at.sidebar.error[0].value
+    return at, None
+
+
+def _peak_rss_bytes():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Fall back to the peak, which only ever grows
+        return _peak_rss_bytes()
+
+
+def warm_up(modes, recorder, timeout):
+    """Run one session per mode so one-off import and index costs are paid
+    before anything is measured. A failure here means the harness or its
+    environment is broken, so it stops the load test."""
+    for mode in modes:
+        _, error = run_session(mode, timeout)
+        if error:
+            raise RuntimeError(f"Warm-up {mode} session failed: {error}")
+        recorder.drain(mode)
+    gc.collect()
+
+
+def run_level(mode, sessions, recorder, timeout):
+    """Run `sessions` concurrent sessions of one mode and collect metrics.
+
+    Finished sessions stay alive until memory has been measured, as a real
+    session keeps its state until the browser disconnects.
+    """
+    from model_router import percentile
+
+    gc.collect()
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+
+    live_sessions = []
+    errors = []
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(run_session, mode, timeout) for _ in range(sessions)]
+        for future in futures:
+            try:
+                at, error = future.result()
+                live_sessions.append(at)
+            except Exception as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            if error:
+                errors.append(error)
+
+    wall = time.perf_counter() - start
+    gc.collect()
+    rss_after = _rss_bytes()
+    turns, rounds = recorder.drain(mode)
+    turns = sorted(turns)
+    completed = sessions - len(errors)
+    live = len(live_sessions)
+    del live_sessions
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "completed": completed,
+        "errors": errors[:3],
+        "wall_seconds": wall,
+        "sessions_per_minute": completed / wall * 60 if wall else 0.0,
+        "turns": len(turns),
+        "rounds_per_session": rounds / sessions,
+        "turn_p50": percentile(turns, 50),
+        "turn_p95": percentile(turns, 95),
+        "turn_p99": percentile(turns, 99),
+        "mb_per_session": max(0, rss_after - rss_before) / live / 2 ** 20 if live else None,
+        "peak_rss_mb": _peak_rss_bytes() / 2 ** 20
+    }
+
+
+def find_saturation(results, min_gain=0.1, latency_factor=2.0):
+    """First concurrency level where adding sessions stops paying off.
+
+    A level saturates the worker when throughput grows by less than
+    `min_gain` over the previous level, or when p95 turn latency exceeds
+    `latency_factor` times the single-level baseline.
+    """
+    baseline = results[0]["turn_p95"] if results else None
+    for previous, current in zip(results, results[1:]):
+        if current["sessions_per_minute"] < previous["sessions_per_minute"] * (1 + min_gain):
+            return current["sessions"]
+        if baseline and current["turn_p95"] and current["turn_p95"] > baseline * latency_factor:
+            return current["sessions"]
+    return None
+
+
+def _format_seconds(value):
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def _format_mb(value):
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test one Streamlit worker running main.py.")
+    parser.add_argument("--modes", default=",".join(MODE_INPUTS),
+                        help="comma-separated modes to drive")
+    parser.add_argument("--levels", default="1,2,4,8",
+                        help="comma-separated numbers of concurrent sessions")
+    parser.add_argument("--latency", type=float, default=0.5, help="mean fake LLM latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1, help="std-dev of fake LLM latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--pages", type=int, default=20,
+                        help="pages in the generated test paper, one retrieval chunk each")
+    parser.add_argument("--response-words", type=int, default=120, help="words per fake completion")
+    parser.add_argument("--timeout", type=float, default=900, help="per-session timeout in seconds")
+    parser.add_argument("--json", help="also write the raw results to this file")
+    args = parser.parse_args()
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    modes = [mode.strip() for mode in args.modes.split(",")]
+    levels = [int(level) for level in args.levels.split(",")]
+
+    server = FakeOpenAIServer(args.latency, args.jitter, args.error_rate, args.response_words).start()
+    os.environ["OPENAI_API_BASE"] = server.base_url
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+
+    _patch_file_uploader(_sample_pdf(args.pages))
+    recorder = TurnRecorder()
+    recorder.install()
+
+    # Keep anything the app writes out of the repository
+    original_cwd = os.getcwd()
+    workdir = tempfile.TemporaryDirectory(prefix="dualbot-load-test-")
+    os.chdir(workdir.name)
+
+    report = {}
+    try:
+        with shared_test_runtime():
+            warm_up(modes, recorder, args.timeout)
+            for mode in modes:
+                results = []
+                for sessions in levels:
+                    result = run_level(mode, sessions, recorder, args.timeout)
+                    results.append(result)
+                    print(f"{mode:<24} n={sessions:<3} done={result['completed']:<3} "
+                          f"wall={result['wall_seconds']:7.1f}s "
+                          f"thru={result['sessions_per_minute']:6.2f}/min "
+                          f"rounds={result['rounds_per_session']:.1f}/session "
+                          f"turn p50/p95/p99={_format_seconds(result['turn_p50'])}/"
+                          f"{_format_seconds(result['turn_p95'])}/{_format_seconds(result['turn_p99'])}s "
+                          f"mem={_format_mb(result['mb_per_session'])}MB/session "
+                          f"peak={result['peak_rss_mb']:.0f}MB", flush=True)
+                    for error in result["errors"]:
+                        print(f"    error: {error}")
+                saturation = find_saturation(results)
+                report[mode] = {"levels": results, "saturation": saturation}
+                print(f"{mode}: saturates at "
+                      f"{saturation if saturation else 'none of the tested levels'}"
+                      f"{' concurrent sessions' if saturation else ''}\n")
+    finally:
+        server.stop()
+        os.chdir(original_cwd)
+        workdir.cleanup()
+
+    print(f"Fake server handled {server.requests} requests.")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
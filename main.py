@@ -3,8 +3,11 @@ from streamlit_chat import message
 from debate import DualDebateBots
 from paper_digest import JournalistBot, AuthorBot
 from peer_review import PeerReviewAuthorBot, PeerReviewReviewerBot
+from model_router import ModelRouter
+from adaptive_stopping import CoverageController
 import time
 import os
+import tempfile
 from langchain.vectorstores import FAISS
 from langchain.embeddings import OpenAIEmbeddings
 from langchain.document_loaders import PyPDFLoader
@@ -91,6 +94,9 @@ if "bot2_mesg" not in st.session_state:
     st.session_state["bot2_mesg"] = []
 if 'message_counter' not in st.session_state:
     st.session_state["message_counter"] = 0
+if 'model_router' not in st.session_state:
+    st.session_state["model_router"] = ModelRouter('OpenAI')
+router = st.session_state["model_router"]
 # Common conversation container
 conversation_container = st.container()
 
@@ -115,7 +121,7 @@ if mode == 'Debate':
             with conversation_container:
                 st.write(f"""#### Debate 💬: {scenario}""")
                 with st.spinner("Setting up debate arena..."):
-                    DualDebateBots = DualDebateBots('OpenAI', role_dict, scenario, session_length)
+                    DualDebateBots = DualDebateBots('OpenAI', role_dict, scenario, session_length, router=router)
                     st.session_state['DualDebateBots'] = DualDebateBots
                 
                 for _ in range(MAX_EXCHANGE_COUNTS[session_length]['Debate']):
@@ -163,37 +169,47 @@ elif mode == 'Paper Digest':
             with conversation_container:
                 st.write(f"#### Paper Digest: {topic}")
                 with st.spinner("Initializing bots..."):
-                    with open("temp.pdf", "wb") as f:
+                    # Each upload gets its own file so concurrent sessions never share one
+                    with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
                         f.write(uploaded_file.getbuffer())
-                    
-                    loader = PyPDFLoader("temp.pdf")
-                    pages = loader.load_and_split()
+                        f.flush()
+                        loader = PyPDFLoader(f.name)
+                        pages = loader.load_and_split()
                     embeddings = OpenAIEmbeddings()
                     vectorstore = FAISS.from_documents(pages, embeddings)
                     
-                    journalist = JournalistBot('OpenAI')
+                    journalist = JournalistBot('OpenAI', router=router)
                     journalist.instruct(topic, abstract)
-                    author = AuthorBot('OpenAI', vectorstore)
+                    author = AuthorBot('OpenAI', vectorstore, router=router)
                     author.instruct(topic)
+                    controller = CoverageController(embeddings, total_chunks=len(pages))
                     
                     st.session_state.interview_history = []
                     question = journalist.step("")
                 
-                for _ in range(6):
+                for i in range(controller.max_rounds):
                     with st.spinner("Journalist is thinking..."):
                         st.session_state.interview_history.append(("Q", question))
-                        message(question, key=f"q_{_}", avatar_style="bottts", seed=AVATAR_SEED[0])
+                        message(question, key=f"q_{i}", avatar_style="bottts", seed=AVATAR_SEED[0])
                     
                     with st.spinner("Author is responding..."):
-                        answer, _ = author.step(question)
+                        answer, source_documents = author.step(question)
                         st.session_state.interview_history.append(("A", answer))
-                        message(answer, is_user=True, key=f"a_{_}", avatar_style="bottts", seed=AVATAR_SEED[1])
+                        message(answer, is_user=True, key=f"a_{i}", avatar_style="bottts", seed=AVATAR_SEED[1])
+                    
+                    # Stop once new rounds no longer reach unseen parts of the paper
+                    controller.update(question, source_documents)
+                    if controller.should_stop():
+                        break
                     
                     with st.spinner("Generating next question..."):
                         question = journalist.step(answer)
                     
                     time.sleep(1)
                 
+                st.caption(f"Stopped after {len(controller.gains)} rounds, "
+                           f"covering {controller.coverage:.0%} of the paper")
+                
                 with st.spinner("Generating summary..."):
                     st.session_state.interview_summary = author.summary(
                         "\n".join([f"{t}: {c}" for t,c in st.session_state.interview_history])
@@ -229,23 +245,25 @@ elif mode == 'Peer-review Simulation':
             with conversation_container:
                 st.write(f"#### Peer Review: {paper_title}")
                 with st.spinner("Initializing review process..."):
-                    with open("review_temp.pdf", "wb") as f:
+                    # Each upload gets its own file so concurrent sessions never share one
+                    with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
                         f.write(uploaded_paper.getbuffer())
-                    
-                    loader = PyPDFLoader("review_temp.pdf")
-                    pages = loader.load_and_split()
+                        f.flush()
+                        loader = PyPDFLoader(f.name)
+                        pages = loader.load_and_split()
                     embeddings = OpenAIEmbeddings()
                     vectorstore = FAISS.from_documents(pages, embeddings)
                     
-                    author_bot = PeerReviewAuthorBot('OpenAI')
+                    author_bot = PeerReviewAuthorBot('OpenAI', router=router)
                     author_bot.instruct(paper_title, paper_abstract, vectorstore)
                     
-                    reviewer_bot = PeerReviewReviewerBot('OpenAI')
+                    reviewer_bot = PeerReviewReviewerBot('OpenAI', router=router)
                     reviewer_bot.instruct(paper_title, paper_abstract, review_focus, rigor_level)
+                    controller = CoverageController(embeddings, total_chunks=len(pages), max_rounds=10)
                     
                     st.session_state.review_history = []
                 
-                for i in range(4):
+                for i in range(controller.max_rounds):
                     with st.spinner("Reviewer is formulating question..."):
                         question = reviewer_bot.generate_question()
                         st.session_state.review_history.append(("Reviewer", question))
@@ -258,8 +276,15 @@ elif mode == 'Peer-review Simulation':
                         message(answer, is_user=True, avatar_style="bottts",
                                seed=AVATAR_SEED[1], key=f"rev_a_{i}")
                     
+                    controller.update(question, author_bot.source_documents)
+                    if controller.should_stop():
+                        break
+                    
                     time.sleep(1)
                 
+                st.caption(f"Stopped after {len(controller.gains)} rounds, "
+                           f"covering {controller.coverage:.0%} of the paper")
+                
                 with st.spinner("Generating final verdict..."):
                     verdict = reviewer_bot.generate_verdict()
                     st.session_state.review_history.append(("Verdict", verdict))
@@ -277,3 +302,12 @@ elif mode == 'Peer-review Simulation':
             st.markdown("**Author Responses:**")
             st.write(st.session_state.review_summary['responses'])
 
+# --- Model Routing Stats ---
+if router.latencies:
+    with st.sidebar.expander("⏱️ Model Latency"):
+        for route, stats in router.latency_summary().items():
+            p50 = f"{stats['p50']:.2f}s" if stats['p50'] is not None else "-"
+            p95 = f"{stats['p95']:.2f}s" if stats['p95'] is not None else "-"
+            models = ", ".join(f"{name} ×{count}" for name, count in stats['models'].items()) or "-"
+            st.markdown(f"**{route}**: {stats['succeeded']} succeeded, p50 {p50}, p95 {p95}, "
+                        f"{stats['failovers']} failovers  \nanswered by: {models}")
@@ -0,0 +1,200 @@
+import time
+import threading
+from collections import deque
+from typing import Any, List, Optional
+
+from langchain.callbacks.manager import CallbackManagerForLLMRun
+from langchain.chat_models import ChatOpenAI
+from langchain.chat_models.base import BaseChatModel
+from langchain.schema import BaseMessage, ChatResult
+
+# Latency/quality policy for every kind of call the bots make. `models` is the
+# fallback chain, tried in order; `timeout` is the per-attempt request timeout
+# in seconds. Short, cheap calls go to a fast model first. Only the last model
+# in a chain retries with backoff, `max_retries` times (ChatOpenAI's default).
+ROUTE_POLICIES = {
+    'debate_turn': {
+        'models': ['gpt-4', 'gpt-4o'],
+        'temperature': 0.7,
+        'timeout': 60
+    },
+    'journalist_question': {
+        'models': ['gpt-4o', 'gpt-4o-mini'],
+        'temperature': 0.8,
+        'timeout': 30
+    },
+    'author_answer': {
+        'models': ['gpt-4o', 'gpt-4o-mini'],
+        'temperature': 0.8,
+        'timeout': 60
+    },
+    'reviewer_question': {
+        'models': ['gpt-4o-mini', 'gpt-4o'],
+        'temperature': 0.7,
+        'timeout': 20
+    },
+    'verdict': {
+        'models': ['gpt-4o', 'gpt-4'],
+        'temperature': 0.5,
+        'timeout': 90
+    },
+    'summary': {
+        'models': ['gpt-4o', 'gpt-4o-mini'],
+        'temperature': 0.5,
+        'timeout': 90
+    }
+}
+
+# Transient errors that move a call on to the next model in the chain instead
+# of surfacing: timeouts, rate limits, 5xx and dropped connections. Matched by
+# name so both the 0.x and 1.x OpenAI SDKs are covered.
+FAILOVER_ERRORS = {
+    'Timeout', 'APITimeoutError', 'TimeoutError', 'RateLimitError',
+    'APIConnectionError', 'ServiceUnavailableError', 'InternalServerError',
+    'ConnectionError'
+}
+
+
+def _is_failover_error(exc):
+    if type(exc).__name__ in FAILOVER_ERRORS:
+        return True
+    status = getattr(exc, 'status_code', None) or getattr(exc, 'http_status', None)
+    if status is None and type(exc).__name__ == 'APIError':
+        # The 0.x SDK raises a bare APIError for malformed server responses
+        return True
+    return status == 429 or (status is not None and status >= 500)
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that walks a route's fallback chain and reports
+    every attempt back to the router."""
+
+    route: str
+    models: List[BaseChatModel]
+    router: Any
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def _llm_type(self):
+        return "routed-chat"
+
+    @property
+    def _identifying_params(self):
+        return {
+            'route': self.route,
+            'models': [model.model_name for model in self.models]
+        }
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        last_error = None
+        for model in self.models:
+            start = time.perf_counter()
+            try:
+                result = model._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                if not _is_failover_error(exc):
+                    raise
+                self.router.record(self.route, model.model_name, time.perf_counter() - start, failed=True)
+                last_error = exc
+                continue
+            self.router.record(self.route, model.model_name, time.perf_counter() - start)
+            return result
+        if last_error is None:
+            raise ValueError(f"No models configured for route '{self.route}'")
+        raise last_error
+
+
+class ModelRouter:
+    """Hands out chat models per call type and keeps per-route latency."""
+
+    def __init__(self, engine, policies=None, history=200):
+        """Select the backend and the routing policies.
+
+        Args:
+        ------
+        engine: the backbone llm-based chat model.
+        policies: optional overrides for ROUTE_POLICIES.
+        history: number of most recent calls kept per route.
+        """
+        if engine != 'OpenAI':
+            raise KeyError("Unsupported chat model!")
+        self.engine = engine
+        self.policies = {route: dict(policy) for route, policy in ROUTE_POLICIES.items()}
+        for route, policy in (policies or {}).items():
+            self.policies.setdefault(route, {}).update(policy)
+
+        self.history = history
+        self._lock = threading.Lock()
+        self.latencies = {}
+
+    def chat_model(self, route, temperature=None):
+        """Build the chat model for a call type.
+
+        Args:
+        ------
+        route: one of the keys of the routing policies.
+        temperature: overrides the route's default temperature.
+        """
+        policy = self.policies[route]
+        if temperature is None:
+            temperature = policy['temperature']
+
+        # Earlier models fail over at once; the last one keeps the usual
+        # retry-with-backoff budget so the chain never gives up on the first error.
+        model_names = policy['models']
+        models = [
+            ChatOpenAI(
+                model_name=model_name,
+                temperature=temperature,
+                request_timeout=policy['timeout'],
+                max_retries=policy.get('max_retries', 6) if i == len(model_names) - 1 else 0
+            )
+            for i, model_name in enumerate(model_names)
+        ]
+        return RoutedChatModel(route=route, models=models, router=self)
+
+    def record(self, route, model_name, seconds, failed=False):
+        with self._lock:
+            self.latencies.setdefault(route, deque(maxlen=self.history)).append({
+                'model': model_name,
+                'seconds': seconds,
+                'failed': failed
+            })
+
+    def latency_summary(self):
+        """Per-route successful calls, failovers, latency percentiles and the
+        models that answered, over the recent call history."""
+        summary = {}
+        with self._lock:
+            records = {route: list(calls) for route, calls in self.latencies.items()}
+
+        for route, calls in records.items():
+            ok = sorted(call['seconds'] for call in calls if not call['failed'])
+            models = {}
+            for call in calls:
+                if not call['failed']:
+                    models[call['model']] = models.get(call['model'], 0) + 1
+            summary[route] = {
+                'succeeded': len(ok),
+                'failovers': len(calls) - len(ok),
+                'p50': percentile(ok, 50),
+                'p95': percentile(ok, 95),
+                'models': models
+            }
+        return summary
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of already sorted values, or None if empty."""
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
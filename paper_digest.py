@@ -7,23 +7,21 @@ from langchain.prompts import (
     PromptTemplate
 )
 from langchain.chains import ConversationChain, LLMChain
-from langchain.chat_models import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
 import os
 from abc import ABC, abstractmethod
+from model_router import ModelRouter
 
 class Chatbot(ABC):
+
+    # Routing policy used for this bot's turns
+    route = None
       
-    def __init__(self, engine):
+    def __init__(self, engine, router=None):
         
         # Instantiate llm
-        if engine == 'OpenAI':
-            self.llm = ChatOpenAI(
-                model_name="gpt-4o",
-                temperature=0.8
-            )
-        else:
-            raise KeyError("Currently unsupported chat model type!")
+        self.router = router or ModelRouter(engine)
+        self.llm = self.router.chat_model(self.route)
 
     @abstractmethod
     def instruct(self):
@@ -38,11 +36,13 @@ class Chatbot(ABC):
         pass
     
 class JournalistBot(Chatbot):
+
+    route = 'journalist_question'
     
-    def __init__(self, engine):
+    def __init__(self, engine, router=None):
         
         # Instantiate llm
-        super().__init__(engine)
+        super().__init__(engine, router)
         
         # Instantiate memory
         self.memory = ConversationBufferMemory(return_messages=True)
@@ -107,8 +107,10 @@ class JournalistBot(Chatbot):
 
 class AuthorBot(Chatbot):
     """Class definition for the author bot, created with LangChain."""
+
+    route = 'author_answer'
     
-    def __init__(self, engine, vectorstore, debug=False):
+    def __init__(self, engine, vectorstore, debug=False, router=None):
         """Select backbone large language model, as well as instantiate 
         the memory for creating language chain in LangChain.
         
@@ -116,10 +118,11 @@ class AuthorBot(Chatbot):
         --------------
         engine: the backbone llm-based chat model.
         vectorstore: embedding vectors of the paper.
+        router: model router shared with the other bots of the session.
         """
         
         # Instantiate llm
-        super().__init__(engine)
+        super().__init__(engine, router)
         
         # Instantiate memory
         self.chat_history = []
@@ -129,7 +132,7 @@ class AuthorBot(Chatbot):
 
         self.debug = debug
         
-        self.summary_bot = ChatOpenAI(model_name="gpt-4o", temperature=0.5)
+        self.summary_bot = self.router.chat_model('summary')
         
     def instruct(self, topic):
         """Determine the context of author chatbot. 
@@ -1,11 +1,14 @@
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
-from langchain.chat_models import ChatOpenAI
+from model_router import ModelRouter
 
 class PeerReviewAuthorBot:
-    def __init__(self, engine):
-        self.llm = ChatOpenAI(model_name="gpt-4o", temperature=0.7)
+    def __init__(self, engine, router=None):
+        self.router = router or ModelRouter(engine)
+        self.llm = self.router.chat_model('author_answer', temperature=0.7)
+        self.summary_llm = self.router.chat_model('summary', temperature=0.7)
         self.responses = []
+        self.source_documents = []
         
     def instruct(self, title, abstract, vectorstore):
         """Initialize author bot with paper content"""
@@ -23,16 +26,23 @@ class PeerReviewAuthorBot:
         Abstract: {abstract}"""
 
     def respond_to_question(self, question):
+        # Ground the response in the most relevant chunks of the paper
+        self.source_documents = self.vectorstore.similarity_search(question, k=3)
+        context = "\n\n".join(doc.page_content for doc in self.source_documents)
+
         prompt = PromptTemplate(
-            input_variables=["question"],
+            input_variables=["context", "question"],
             template=f"""{self.system_prompt}
             
+            Relevant excerpts from the paper:
+            {{context}}
+            
             Reviewer Question: {{question}}
             Author Response:"""
         )
         
         chain = LLMChain(llm=self.llm, prompt=prompt)
-        response = chain.run({"question": question})
+        response = chain.run({"context": context, "question": question})
         self.responses.append((question, response))
         return response
         
@@ -45,19 +55,22 @@ class PeerReviewAuthorBot:
         2. 2 potential weaknesses
         3. Key evidence provided"""
         
-        return LLMChain(llm=self.llm, 
+        return LLMChain(llm=self.summary_llm, 
                       prompt=PromptTemplate.from_template(summary_prompt)
                      ).run({"responses": self.responses})
 
 class PeerReviewReviewerBot:
-    def __init__(self, engine):
-        self.llm = ChatOpenAI(model_name="gpt-4o")
+    def __init__(self, engine, router=None):
+        self.router = router or ModelRouter(engine)
         self.critiques = []
         
     def instruct(self, title, abstract, focus_areas, rigor_level):
         """Initialize reviewer bot with evaluation parameters"""
         # Convert rigor_level (0-100) to temperature (0.1-0.9)
-        self.llm.temperature = 0.9 - (rigor_level/100 * 0.8)
+        temperature = 0.9 - (rigor_level/100 * 0.8)
+        self.llm = self.router.chat_model('reviewer_question', temperature=temperature)
+        self.verdict_llm = self.router.chat_model('verdict', temperature=temperature)
+        self.summary_llm = self.router.chat_model('summary', temperature=temperature)
         
         self.system_prompt = f"""As peer reviewer of "{title}":
         - Focus: {', '.join(focus_areas)}
@@ -70,15 +83,21 @@ class PeerReviewReviewerBot:
         Abstract: {abstract}"""
 
     def generate_question(self):
+        # Show earlier questions so each round moves on to new material
+        asked = "\n".join(f"- {critique}" for critique in self.critiques) or "None yet."
         prompt = PromptTemplate(
-            input_variables=[],
+            input_variables=["asked"],
             template=f"""{self.system_prompt}
             
-            Generate a critical review question:"""
+            Questions already asked:
+            {{asked}}
+            
+            Generate a critical review question about an aspect of the paper
+            not covered by the questions above:"""
         )
         
         chain = LLMChain(llm=self.llm, prompt=prompt)
-        question = chain.run({})
+        question = chain.run({"asked": asked})
         self.critiques.append(question)
         return question
         
@@ -91,7 +110,7 @@ class PeerReviewReviewerBot:
         2. Required revisions
         3. Suggested improvements"""
         
-        return LLMChain(llm=self.llm,
+        return LLMChain(llm=self.verdict_llm,
                       prompt=PromptTemplate.from_template(verdict_template)
                      ).run({"critiques": self.critiques})
         
@@ -105,6 +124,6 @@ class PeerReviewReviewerBot:
         3. Ethical considerations
         4. Suggested improvements"""
         
-        return LLMChain(llm=self.llm,
+        return LLMChain(llm=self.summary_llm,
                       prompt=PromptTemplate.from_template(summary_prompt)
                      ).run({"critiques": self.critiques})
\ No newline at end of file
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from adaptive_stopping import CoverageController
+
+
+class KeywordEmbeddings:
+    """Bag-of-words embeddings over a fixed vocabulary."""
+
+    vocabulary = ['method', 'results', 'dataset', 'baseline', 'ablation', 'ethics']
+
+    def embed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(term)) for term in self.vocabulary]
+
+
+def chunks(*names):
+    return [SimpleNamespace(page_content=name, metadata={'page': 0}) for name in names]
+
+
+def test_repeated_question_with_new_chunk_is_redundant():
+    controller = CoverageController(KeywordEmbeddings(), total_chunks=20)
+    controller.update("describe the method", chunks('c0', 'c1', 'c2'))
+
+    for i in range(3, 8):
+        gain = controller.update("describe the method", chunks('c0', 'c1', f'c{i}'))
+        assert gain == 0.0
+
+    assert controller.should_stop()
+    assert len(controller.gains) < controller.max_rounds
+
+
+def test_novel_question_with_new_chunks_continues():
+    controller = CoverageController(KeywordEmbeddings(), total_chunks=20)
+    controller.update("describe the method", chunks('c0', 'c1', 'c2'))
+    controller.update("what dataset was used", chunks('c3', 'c4', 'c5'))
+    gain = controller.update("how strong is the baseline", chunks('c0', 'c6', 'c7'))
+
+    assert gain > controller.threshold
+    assert not controller.should_stop()
+
+
+def test_stops_once_all_chunks_seen():
+    controller = CoverageController(KeywordEmbeddings(), total_chunks=6)
+    controller.update("describe the method", chunks('c0', 'c1', 'c2'))
+    assert not controller.should_stop()
+
+    controller.update("what dataset was used", chunks('c3', 'c4', 'c5'))
+    assert controller.coverage == 1.0
+    assert controller.should_stop()
+
+
+def test_stops_at_max_rounds():
+    controller = CoverageController(KeywordEmbeddings(), max_rounds=3)
+    questions = ["describe the method", "what dataset was used", "how strong is the baseline"]
+    for i, question in enumerate(questions):
+        assert not controller.should_stop()
+        controller.update(question, chunks(f'c{3 * i}', f'c{3 * i + 1}', f'c{3 * i + 2}'))
+
+    assert controller.should_stop()
+
+
+def test_min_rounds_always_played():
+    controller = CoverageController(KeywordEmbeddings(), min_rounds=2, patience=1)
+    controller.update("describe the method", [])
+
+    assert controller.gains == [0.0]
+    assert not controller.should_stop()
@@ -0,0 +1,129 @@
+from typing import Any
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from langchain.chat_models.base import BaseChatModel
+from langchain.schema import AIMessage, ChatGeneration, ChatResult, HumanMessage
+
+from model_router import ModelRouter, RoutedChatModel
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class APIError(Exception):
+    def __init__(self, message, http_status=None):
+        super().__init__(message)
+        self.http_status = http_status
+
+
+class APIStatusError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class StubChatModel(BaseChatModel):
+    """Answers with its own name, or raises `error` when one is set."""
+
+    model_name: str
+    error: Any = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @property
+    def _llm_type(self):
+        return "stub"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.error is not None:
+            raise self.error
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.model_name))])
+
+
+def routed(router, *models, route='summary'):
+    return RoutedChatModel(route=route, models=list(models), router=router)
+
+
+def answer(model):
+    return model._generate([HumanMessage(content="Hello")]).generations[0].message.content
+
+
+@pytest.mark.parametrize("error", [
+    RateLimitError("slow down"),
+    APIStatusError("bad gateway", status_code=502),
+    APIError("malformed response"),
+])
+def test_transient_error_fails_over_to_next_model(error):
+    router = ModelRouter('OpenAI')
+    model = routed(router, StubChatModel(model_name='fast', error=error), StubChatModel(model_name='backup'))
+
+    assert answer(model) == 'backup'
+
+    stats = router.latency_summary()['summary']
+    assert stats['succeeded'] == 1
+    assert stats['failovers'] == 1
+    assert stats['models'] == {'backup': 1}
+
+
+def test_non_transient_error_is_raised():
+    router = ModelRouter('OpenAI')
+    error = APIStatusError("bad request", status_code=400)
+    model = routed(router, StubChatModel(model_name='fast', error=error), StubChatModel(model_name='backup'))
+
+    with pytest.raises(APIStatusError):
+        answer(model)
+
+
+def test_last_error_raised_when_chain_exhausted():
+    router = ModelRouter('OpenAI')
+    last = RateLimitError("still limited")
+    model = routed(router,
+                   StubChatModel(model_name='fast', error=RateLimitError("limited")),
+                   StubChatModel(model_name='backup', error=last))
+
+    with pytest.raises(RateLimitError) as excinfo:
+        answer(model)
+    assert excinfo.value is last
+    assert router.latency_summary()['summary']['failovers'] == 2
+
+
+def test_empty_chain_raises_value_error():
+    model = routed(ModelRouter('OpenAI'))
+
+    with pytest.raises(ValueError):
+        answer(model)
+
+
+def test_latency_summary_percentiles_and_models():
+    router = ModelRouter('OpenAI')
+    for seconds in [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 2.0]:
+        router.record('verdict', 'gpt-4o', seconds)
+    router.record('verdict', 'gpt-4', 5.0)
+    router.record('verdict', 'gpt-4o', 9.0, failed=True)
+
+    stats = router.latency_summary()['verdict']
+    assert stats['succeeded'] == 12
+    assert stats['failovers'] == 1
+    assert stats['models'] == {'gpt-4o': 11, 'gpt-4': 1}
+    assert stats['p50'] == 0.7
+    assert stats['p95'] == 2.0
+
+
+def test_latency_history_is_bounded():
+    router = ModelRouter('OpenAI', history=3)
+    for seconds in [1.0, 2.0, 3.0, 4.0]:
+        router.record('summary', 'gpt-4o', seconds)
+
+    stats = router.latency_summary()['summary']
+    assert stats['succeeded'] == 3
+    assert stats['p50'] == 3.0
+
+
+def test_unsupported_engine():
+    with pytest.raises(KeyError):
+        ModelRouter('Other')